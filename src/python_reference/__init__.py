@@ -1,10 +1,17 @@
 """Python reference models for CCSDS-123 modules."""
 
-from .local_diff import CtrlSignals, LocalSamples, LocalDiffOutputs, local_diff_reference
+from .local_diff import (
+    CtrlSignals,
+    LocalSamples,
+    LocalDiffOutputs,
+    local_diff_reference,
+    local_diff_reference_batch,
+)
 
 __all__ = [
     "CtrlSignals",
     "LocalSamples",
     "LocalDiffOutputs",
     "local_diff_reference",
+    "local_diff_reference_batch",
 ]
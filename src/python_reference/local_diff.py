@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import NamedTuple
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
-@dataclass(frozen=True)
-class CtrlSignals:
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+
+class CtrlSignals(NamedTuple):
     """Control flags that describe the sample position within the image."""
 
     first_line: bool
@@ -14,8 +23,7 @@ class CtrlSignals:
     last_in_line: bool
 
 
-@dataclass(frozen=True)
-class LocalSamples:
+class LocalSamples(NamedTuple):
     """Neighbourhood samples that feed the local difference logic."""
 
     cur: int
@@ -25,8 +33,7 @@ class LocalSamples:
     west: int
 
 
-@dataclass(frozen=True)
-class LocalDiffOutputs:
+class LocalDiffOutputs(NamedTuple):
     """Outputs produced by the local difference logic."""
 
     local_sum: int
@@ -36,60 +43,177 @@ class LocalDiffOutputs:
     d_w: int
 
 
-def _local_sum_terms(ctrl: CtrlSignals, samples: LocalSamples, column_oriented: bool) -> tuple[int, int]:
-    """Return the two terms that are accumulated to form the local sum."""
-    term1 = 0
-    term2 = 0
-    if column_oriented:
-        term1 = 4 * (samples.north if not ctrl.first_line else samples.west)
-    else:
-        if not ctrl.first_line and not ctrl.first_in_line and not ctrl.last_in_line:
-            term1 = samples.west + samples.north_west
-            term2 = samples.north + samples.north_east
-        elif ctrl.first_line and not ctrl.first_in_line:
-            term1 = 4 * samples.west
-        elif not ctrl.first_line and ctrl.first_in_line:
-            term1 = 2 * samples.north
-            term2 = 2 * samples.north_east
-        elif not ctrl.first_line and ctrl.last_in_line:
-            term1 = samples.west + samples.north_west
-            term2 = 2 * samples.north
-    return term1, term2
-
-
-def local_diff_reference(ctrl: CtrlSignals, samples: LocalSamples, column_oriented: bool) -> LocalDiffOutputs:
-    """Compute the expected local difference outputs for a single pixel."""
-
-    term1, term2 = _local_sum_terms(ctrl, samples, column_oriented)
-    local_sum = term1 + term2
-
-    if ctrl.first_line and ctrl.first_in_line:
+# Local-sum weights ``(west, north_west, north, north_east)`` indexed by
+# ``column_oriented << 3 | first_line << 2 | first_in_line << 1 | last_in_line``.
+_LOCAL_SUM_COEFFS = (
+    # Row-oriented (wide neighbourhood).
+    (1, 1, 1, 1),  # interior
+    (1, 1, 2, 0),  # last_in_line
+    (0, 0, 2, 2),  # first_in_line
+    (0, 0, 2, 2),  # first_in_line, last_in_line
+    (4, 0, 0, 0),  # first_line
+    (4, 0, 0, 0),  # first_line, last_in_line
+    (0, 0, 0, 0),  # first sample of the band
+    (0, 0, 0, 0),  # first sample of the band, last_in_line
+    # Column-oriented (narrow neighbourhood).
+    (0, 0, 4, 0),  # any line but the first
+    (0, 0, 4, 0),
+    (0, 0, 4, 0),
+    (0, 0, 4, 0),
+    (4, 0, 0, 0),  # first_line
+    (4, 0, 0, 0),
+    (4, 0, 0, 0),
+    (4, 0, 0, 0),
+)
+
+
+def _local_diff_core(
+    first_line: bool,
+    first_in_line: bool,
+    last_in_line: bool,
+    cur: int,
+    north: int,
+    north_east: int,
+    north_west: int,
+    west: int,
+    column_oriented: bool,
+) -> tuple[int, int, int, int, int]:
+    """Return ``(local_sum, d_c, d_n, d_nw, d_w)`` for a single pixel.
+
+    Operates on plain scalars so it can be compiled by Numba when available.
+    """
+    c_w, c_nw, c_n, c_ne = _LOCAL_SUM_COEFFS[
+        (column_oriented << 3) | (first_line << 2) | (first_in_line << 1) | last_in_line
+    ]
+    local_sum = c_w * west + c_nw * north_west + c_n * north + c_ne * north_east
+
+    if first_line and first_in_line:
         d_c = 0
         local_sum_out = 0
     else:
-        d_c = 4 * samples.cur - local_sum
+        d_c = 4 * cur - local_sum
         local_sum_out = local_sum
 
-    if ctrl.first_line:
+    if first_line:
         d_n = 0
     else:
-        d_n = 4 * samples.north - local_sum
+        d_n = 4 * north - local_sum
 
-    if ctrl.first_line:
+    if first_line:
         d_w = 0
         d_nw = 0
-    elif ctrl.first_in_line:
-        reflected = 4 * samples.north - local_sum
-        d_w = reflected
-        d_nw = reflected
+    elif first_in_line:
+        d_w = d_n
+        d_nw = d_n
     else:
-        d_w = 4 * samples.west - local_sum
-        d_nw = 4 * samples.north_west - local_sum
-
-    return LocalDiffOutputs(
-        local_sum=local_sum_out,
-        d_c=d_c,
-        d_n=d_n,
-        d_nw=d_nw,
-        d_w=d_w,
+        d_w = 4 * west - local_sum
+        d_nw = 4 * north_west - local_sum
+
+    return local_sum_out, d_c, d_n, d_nw, d_w
+
+
+_local_diff_rows = None
+
+if numba is not None:
+    _local_diff_core = numba.njit(
+        numba.types.UniTuple(numba.types.int64, 5)(
+            numba.types.boolean,
+            numba.types.boolean,
+            numba.types.boolean,
+            numba.types.int64,
+            numba.types.int64,
+            numba.types.int64,
+            numba.types.int64,
+            numba.types.int64,
+            numba.types.boolean,
+        ),
+        cache=True,
+        boundscheck=False,
+    )(_local_diff_core)
+
+    @numba.njit(parallel=True, cache=True)
+    def _local_diff_rows(
+        first_line, first_in_line, last_in_line, cur, north, north_east, north_west, west, column_oriented, out
+    ):
+        """Fill ``out[i]`` with the core outputs of row ``i`` across all cores."""
+        for i in numba.prange(out.shape[0]):
+            out[i] = _local_diff_core(
+                first_line[i],
+                first_in_line[i],
+                last_in_line[i],
+                cur[i],
+                north[i],
+                north_east[i],
+                north_west[i],
+                west[i],
+                column_oriented[i],
+            )
+
+
+def local_diff_reference(ctrl: CtrlSignals, samples: LocalSamples, column_oriented: bool) -> LocalDiffOutputs:
+    """Compute the expected local difference outputs for a single pixel."""
+
+    return LocalDiffOutputs(*_local_diff_core(*ctrl, *samples, column_oriented))
+
+
+def local_diff_reference_batch(
+    first_line,
+    first_in_line,
+    last_in_line,
+    cur,
+    north,
+    north_east,
+    north_west,
+    west,
+    column_oriented,
+) -> dict[str, "np.ndarray"]:
+    """Compute the local difference outputs for whole arrays of pixels at once.
+
+    Mirrors :func:`local_diff_reference` element-wise. Every argument may be a
+    scalar or an array; the results are broadcast together and returned as
+    ``int64`` arrays keyed by the :class:`LocalDiffOutputs` field names. When
+    Numba is installed the rows are evaluated by the compiled core in parallel.
+    """
+    if np is None:
+        raise ImportError("local_diff_reference_batch requires NumPy")
+
+    first_line = np.asarray(first_line, dtype=bool)
+    first_in_line = np.asarray(first_in_line, dtype=bool)
+    last_in_line = np.asarray(last_in_line, dtype=bool)
+    column_oriented = np.asarray(column_oriented, dtype=bool)
+    cur = np.asarray(cur, dtype=np.int64)
+    north = np.asarray(north, dtype=np.int64)
+    north_east = np.asarray(north_east, dtype=np.int64)
+    north_west = np.asarray(north_west, dtype=np.int64)
+    west = np.asarray(west, dtype=np.int64)
+
+    if _local_diff_rows is not None:
+        inputs = np.broadcast_arrays(
+            first_line, first_in_line, last_in_line, cur, north, north_east, north_west, west, column_oriented
+        )
+        shape = inputs[0].shape
+        out = np.empty((inputs[0].size, 5), dtype=np.int64)
+        _local_diff_rows(*(np.ascontiguousarray(values).ravel() for values in inputs), out)
+        return {name: out[:, column].reshape(shape) for column, name in enumerate(LocalDiffOutputs._fields)}
+
+    index = (
+        (column_oriented.astype(np.intp) << 3)
+        | (first_line.astype(np.intp) << 2)
+        | (first_in_line.astype(np.intp) << 1)
+        | last_in_line.astype(np.intp)
     )
+    coeffs = np.asarray(_LOCAL_SUM_COEFFS, dtype=np.int64)[index]
+    local_sum = (
+        coeffs[..., 0] * west + coeffs[..., 1] * north_west + coeffs[..., 2] * north + coeffs[..., 3] * north_east
+    )
+
+    first_sample = first_line & first_in_line
+    reflected = 4 * north - local_sum
+    d_n = np.where(first_line, 0, reflected)
+    return {
+        "local_sum": np.where(first_sample, 0, local_sum),
+        "d_c": np.where(first_sample, 0, 4 * cur - local_sum),
+        "d_n": d_n,
+        "d_nw": np.where(first_in_line, d_n, np.where(first_line, 0, 4 * north_west - local_sum)),
+        "d_w": np.where(first_in_line, d_n, np.where(first_line, 0, 4 * west - local_sum)),
+    }
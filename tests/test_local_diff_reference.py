@@ -0,0 +1,141 @@
+"""Regression tests for the local-diff reference model and its shared vectors."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+VECTOR_PATH = REPO_ROOT / "tests" / "data" / "local_diff_vectors.csv"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from python_reference import (
+    CtrlSignals,
+    LocalDiffOutputs,
+    LocalSamples,
+    local_diff_reference,
+    local_diff_reference_batch,
+)
+
+SAMPLE_SETS = [
+    LocalSamples(cur=101, north=7, north_east=13, north_west=29, west=53),
+    LocalSamples(cur=-32768, north=32767, north_east=-1, north_west=0, west=-12345),
+    LocalSamples(cur=65535, north=65535, north_east=0, north_west=65535, west=1),
+]
+
+FLAG_STATES = [
+    (column_oriented, CtrlSignals(first_line, first_in_line, last_in_line))
+    for column_oriented, first_line, first_in_line, last_in_line in itertools.product((False, True), repeat=4)
+]
+
+
+def _ladder_reference(ctrl: CtrlSignals, samples: LocalSamples, column_oriented: bool) -> LocalDiffOutputs:
+    """The original branch ladder that the coefficient table replaced."""
+    term1 = 0
+    term2 = 0
+    if column_oriented:
+        term1 = 4 * (samples.north if not ctrl.first_line else samples.west)
+    else:
+        if not ctrl.first_line and not ctrl.first_in_line and not ctrl.last_in_line:
+            term1 = samples.west + samples.north_west
+            term2 = samples.north + samples.north_east
+        elif ctrl.first_line and not ctrl.first_in_line:
+            term1 = 4 * samples.west
+        elif not ctrl.first_line and ctrl.first_in_line:
+            term1 = 2 * samples.north
+            term2 = 2 * samples.north_east
+        elif not ctrl.first_line and ctrl.last_in_line:
+            term1 = samples.west + samples.north_west
+            term2 = 2 * samples.north
+    local_sum = term1 + term2
+
+    if ctrl.first_line and ctrl.first_in_line:
+        d_c = 0
+        local_sum_out = 0
+    else:
+        d_c = 4 * samples.cur - local_sum
+        local_sum_out = local_sum
+
+    d_n = 0 if ctrl.first_line else 4 * samples.north - local_sum
+
+    if ctrl.first_line:
+        d_w = 0
+        d_nw = 0
+    elif ctrl.first_in_line:
+        d_w = d_nw = 4 * samples.north - local_sum
+    else:
+        d_w = 4 * samples.west - local_sum
+        d_nw = 4 * samples.north_west - local_sum
+
+    return LocalDiffOutputs(local_sum=local_sum_out, d_c=d_c, d_n=d_n, d_nw=d_nw, d_w=d_w)
+
+
+def _read_vectors() -> list[tuple[bool, CtrlSignals, LocalSamples, LocalDiffOutputs]]:
+    with VECTOR_PATH.open(newline="", encoding="utf-8") as csv_file:
+        rows = []
+        for row in csv.DictReader(csv_file):
+            values = {name: int(value) for name, value in row.items()}
+            rows.append(
+                (
+                    bool(values["column_oriented"]),
+                    CtrlSignals._make(bool(values[name]) for name in CtrlSignals._fields),
+                    LocalSamples._make(values[name] for name in LocalSamples._fields),
+                    LocalDiffOutputs._make(values[name] for name in LocalDiffOutputs._fields),
+                )
+            )
+    return rows
+
+
+def _batch_rows(column_oriented, ctrls, samples) -> list[LocalDiffOutputs]:
+    batch = local_diff_reference_batch(
+        *([getattr(ctrl, name) for ctrl in ctrls] for name in CtrlSignals._fields),
+        *([getattr(sample, name) for sample in samples] for name in LocalSamples._fields),
+        column_oriented,
+    )
+    columns = (batch[name].tolist() for name in LocalDiffOutputs._fields)
+    return [LocalDiffOutputs(*row) for row in zip(*columns)]
+
+
+@pytest.mark.parametrize("column_oriented,ctrl", FLAG_STATES)
+def test_scalar_matches_branch_ladder(column_oriented: bool, ctrl: CtrlSignals) -> None:
+    for samples in SAMPLE_SETS:
+        assert local_diff_reference(ctrl, samples, column_oriented) == _ladder_reference(
+            ctrl, samples, column_oriented
+        )
+
+
+def test_batch_matches_branch_ladder() -> None:
+    pytest.importorskip("numpy")
+    cases = [(column_oriented, ctrl, samples) for column_oriented, ctrl in FLAG_STATES for samples in SAMPLE_SETS]
+    actual = _batch_rows(
+        [column_oriented for column_oriented, _, _ in cases],
+        [ctrl for _, ctrl, _ in cases],
+        [samples for _, _, samples in cases],
+    )
+    expected = [_ladder_reference(ctrl, samples, column_oriented) for column_oriented, ctrl, samples in cases]
+    assert actual == expected
+
+
+def test_vectors_match_reference() -> None:
+    vectors = _read_vectors()
+    assert vectors
+    for column_oriented, ctrl, samples, expected in vectors:
+        assert local_diff_reference(ctrl, samples, column_oriented) == expected
+
+
+def test_vectors_match_batch_reference() -> None:
+    pytest.importorskip("numpy")
+    vectors = _read_vectors()
+    actual = _batch_rows(
+        [column_oriented for column_oriented, _, _, _ in vectors],
+        [ctrl for _, ctrl, _, _ in vectors],
+        [samples for _, _, samples, _ in vectors],
+    )
+    assert actual == [expected for _, _, _, expected in vectors]
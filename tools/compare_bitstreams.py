@@ -4,23 +4,41 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
+from functools import lru_cache
+import mmap
+import os
 import struct
 import subprocess
 import sys
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import BinaryIO
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 DEBUG_BYTES = 32
 MISMATCH_LIMIT = 8
+SCAN_BLOCK_BYTES = 1 << 20
 
 HEADER_V2_FORMAT = "<4s7H3I"
 HEADER_V3_FORMAT = "<4s8H5h4H2I"
+_VERSION_STRUCT = struct.Struct("<H")
+_HEADER_V2_STRUCT = struct.Struct(HEADER_V2_FORMAT)
+_HEADER_V3_STRUCT = struct.Struct(HEADER_V3_FORMAT)
 HEADER_FORMATS = {
-    2: (HEADER_V2_FORMAT, struct.calcsize(HEADER_V2_FORMAT), 8),
-    3: (HEADER_V3_FORMAT, struct.calcsize(HEADER_V3_FORMAT), 18),
+    2: (_HEADER_V2_STRUCT, _HEADER_V2_STRUCT.size, 8),
+    3: (_HEADER_V3_STRUCT, _HEADER_V3_STRUCT.size, 18),
 }
+_MIN_HEADER_SIZE = min(size for _, size, _ in HEADER_FORMATS.values())
 MAGIC = b"C123"
+# Maps every byte to itself if printable ASCII, otherwise to ".".
+_PRINTABLE_ASCII = bytes(value if 32 <= value < 127 else ord(".") for value in range(256))
 
 
 @dataclass(frozen=True)
@@ -28,38 +46,55 @@ class ContainerInfo:
     """Minimal view of a CCSDS-123 container header and payload."""
 
     header_values: tuple[int | bytes, ...]
-    header_bytes: bytes
-    payload: bytes
+    header_bytes: memoryview
+    payload: memoryview
     payload_bits: int
+    version: int
+    dimensions: tuple[int, int, int, int]
+    expected_payload_bytes: int
+
+    @classmethod
+    def from_header(
+        cls,
+        header_values: tuple[int | bytes, ...],
+        header_bytes: memoryview,
+        payload: memoryview,
+        payload_bits: int,
+    ) -> ContainerInfo:
+        nx = int(header_values[2])
+        ny = int(header_values[3])
+        nz = int(header_values[4])
+        depth = int(header_values[5])
+        return cls(
+            header_values,
+            header_bytes,
+            payload,
+            payload_bits,
+            int(header_values[1]),
+            (nx, ny, nz, depth),
+            (payload_bits + 7) // 8,
+        )
 
-    @property
-    def version(self) -> int:
-        return int(self.header_values[1])
-
-    @property
-    def dimensions(self) -> tuple[int, int, int, int]:
-        nx = int(self.header_values[2])
-        ny = int(self.header_values[3])
-        nz = int(self.header_values[4])
-        depth = int(self.header_values[5])
-        return nx, ny, nz, depth
 
-    @property
-    def expected_payload_bytes(self) -> int:
-        return (self.payload_bits + 7) // 8
+def map_file(path: Path) -> memoryview:
+    """Map ``path`` read-only; the mapping is released once the view is dropped."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
 
 
 def format_slice(data: bytes, base_index: int, width: int = 16) -> str:
     if not data:
         return f"{base_index:08X}: <empty>"
+    data = bytes(data)
+    hex_width = width * 3 - 1
     lines: list[str] = []
     for offset in range(0, len(data), width):
         chunk = data[offset : offset + width]
-        hex_bytes = " ".join(f"{value:02X}" for value in chunk)
-        ascii_repr = "".join(chr(value) if 32 <= value < 127 else "." for value in chunk)
-        lines.append(
-            f"{base_index + offset:08X}: {hex_bytes:<{width * 3 - 1}} |{ascii_repr}|"
-        )
+        hex_bytes = chunk.hex(" ").upper()
+        ascii_repr = chunk.translate(_PRINTABLE_ASCII).decode("ascii")
+        lines.append(f"{base_index + offset:08X}: {hex_bytes:<{hex_width}} |{ascii_repr}|")
     return "\n".join(lines)
 
 
@@ -83,64 +118,81 @@ def decode_container(
     return result
 
 
-def compare_raw_streams(label: str, original: Path, reconstructed: Path) -> int:
-    original_bytes = original.read_bytes()
-    reconstructed_bytes = reconstructed.read_bytes()
-    if original_bytes == reconstructed_bytes:
-        print(f"{label}: decoded samples match the input stream")
-        return 0
+def read_range(handle: BinaryIO, start: int, end: int) -> bytes:
+    handle.seek(start)
+    return handle.read(max(0, end - start))
 
-    print(
-        f"{label}: decoded samples differ from the input stream",
-        file=sys.stderr,
-    )
-    mismatch_limit = min(MISMATCH_LIMIT, len(reconstructed_bytes), len(original_bytes))
-    differing_indices: list[int] = []
-    for idx in range(min(len(original_bytes), len(reconstructed_bytes))):
-        if original_bytes[idx] != reconstructed_bytes[idx]:
-            differing_indices.append(idx)
-            if len(differing_indices) >= mismatch_limit:
+
+def compare_raw_streams(label: str, original: Path, reconstructed: Path) -> int:
+    original_size = original.stat().st_size
+    reconstructed_size = reconstructed.stat().st_size
+    with original.open("rb") as original_file, reconstructed.open("rb") as reconstructed_file:
+        # Stream both files block by block; equal blocks cost one memcmp each and
+        # the scan stops at the first block that differs.
+        first_diff = None
+        offset = 0
+        while True:
+            original_block = original_file.read(SCAN_BLOCK_BYTES)
+            reconstructed_block = reconstructed_file.read(SCAN_BLOCK_BYTES)
+            if original_block != reconstructed_block:
+                compare_len = min(len(original_block), len(reconstructed_block))
+                block_diff = first_mismatch(original_block, reconstructed_block, 0, compare_len)
+                if block_diff is not None:
+                    first_diff = offset + block_diff
+                break
+            if not original_block:
                 break
+            offset += len(original_block)
 
-    if len(original_bytes) != len(reconstructed_bytes):
-        print(
-            f"  Length mismatch: input={len(original_bytes)} bytes, "
-            f"decoded={len(reconstructed_bytes)} bytes",
-            file=sys.stderr,
-        )
+        if first_diff is None and original_size == reconstructed_size:
+            print(f"{label}: decoded samples match the input stream")
+            return 0
 
-    if differing_indices:
-        first_diff = differing_indices[0]
         print(
-            f"  First mismatch at byte {first_diff}: "
-            f"input=0x{original_bytes[first_diff]:02X} decoded=0x{reconstructed_bytes[first_diff]:02X}",
+            f"{label}: decoded samples differ from the input stream",
             file=sys.stderr,
         )
-        start = max(0, first_diff - DEBUG_BYTES // 2)
-        end = min(len(original_bytes), first_diff + DEBUG_BYTES // 2)
-        print("  Input slice:", file=sys.stderr)
-        print(format_slice(original_bytes[start:end], start), file=sys.stderr)
-        end_decoded = min(len(reconstructed_bytes), first_diff + DEBUG_BYTES // 2)
-        print("  Decoded slice:", file=sys.stderr)
-        print(format_slice(reconstructed_bytes[start:end_decoded], start), file=sys.stderr)
-    return 1
+
+        if original_size != reconstructed_size:
+            print(
+                f"  Length mismatch: input={original_size} bytes, "
+                f"decoded={reconstructed_size} bytes",
+                file=sys.stderr,
+            )
+
+        if first_diff is not None:
+            start = max(0, first_diff - DEBUG_BYTES // 2)
+            end = min(original_size, first_diff + DEBUG_BYTES // 2)
+            end_decoded = min(reconstructed_size, first_diff + DEBUG_BYTES // 2)
+            original_slice = read_range(original_file, start, end)
+            decoded_slice = read_range(reconstructed_file, start, end_decoded)
+            print(
+                f"  First mismatch at byte {first_diff}: "
+                f"input=0x{original_slice[first_diff - start]:02X} "
+                f"decoded=0x{decoded_slice[first_diff - start]:02X}",
+                file=sys.stderr,
+            )
+            print("  Input slice:", file=sys.stderr)
+            print(format_slice(original_slice, start), file=sys.stderr)
+            print("  Decoded slice:", file=sys.stderr)
+            print(format_slice(decoded_slice, start), file=sys.stderr)
+        return 1
 
 
 def parse_container(path: Path) -> ContainerInfo:
-    data = path.read_bytes()
-    min_header_size = min(size for _, size, _ in HEADER_FORMATS.values())
-    if len(data) < min_header_size:
+    data = map_file(path)
+    if len(data) < _MIN_HEADER_SIZE:
         raise ValueError(f"Container '{path}' is too small ({len(data)} bytes)")
 
     if data[:4] != MAGIC:
-        raise ValueError(f"Container '{path}' has invalid magic {data[:4]!r}")
+        raise ValueError(f"Container '{path}' has invalid magic {bytes(data[:4])!r}")
 
-    (version,) = struct.unpack_from("<H", data, 4)
+    (version,) = _VERSION_STRUCT.unpack_from(data, 4)
 
     if version not in HEADER_FORMATS:
         raise ValueError(f"Container '{path}' has unsupported version {version}")
 
-    fmt, header_size, payload_index = HEADER_FORMATS[version]
+    header_struct, header_size, payload_index = HEADER_FORMATS[version]
     if len(data) < header_size:
         raise ValueError(
             f"Container '{path}' is too small for version {version} header "
@@ -148,7 +200,7 @@ def parse_container(path: Path) -> ContainerInfo:
         )
 
     header_bytes = data[:header_size]
-    header = struct.unpack(fmt, header_bytes)
+    header = header_struct.unpack_from(data)
     if header[0] != MAGIC:
         raise ValueError(f"Container '{path}' has invalid magic {header[0]!r}")
 
@@ -160,7 +212,7 @@ def parse_container(path: Path) -> ContainerInfo:
         raise ValueError(
             f"Container '{path}' payload truncated: expected {payload_bytes} bytes, got {len(payload)}"
         )
-    return ContainerInfo(header, header_bytes, payload, payload_bits)
+    return ContainerInfo.from_header(header, header_bytes, payload, payload_bits)
 
 
 def bit_at(data: bytes, bit_index: int) -> int:
@@ -171,6 +223,136 @@ def bit_at(data: bytes, bit_index: int) -> int:
     return (byte >> (7 - bit_offset)) & 1
 
 
+def buffers_equal(first: bytes, second: bytes) -> bool:
+    """Return whether two buffers hold the same bytes, comparing block-wise with memcmp."""
+    if len(first) != len(second):
+        return False
+    first_view = memoryview(first)
+    second_view = memoryview(second)
+    for start in range(0, len(first), SCAN_BLOCK_BYTES):
+        end = start + SCAN_BLOCK_BYTES
+        if first_view[start:end].tobytes() != second_view[start:end].tobytes():
+            return False
+    return True
+
+
+def first_mismatch(first: bytes, second: bytes, start: int, end: int) -> int | None:
+    """Return the first index in ``[start, end)`` where the buffers differ, or ``None``.
+
+    Equal regions are skipped with slice comparisons over doubling windows;
+    the first differing window is then bisected down to a single byte.
+    """
+    window = 4096
+    while start < end:
+        stop = min(start + window, end)
+        if first[start:stop] == second[start:stop]:
+            start = stop
+            window *= 2
+            continue
+        while stop - start > 1:
+            mid = (start + stop) // 2
+            if first[start:mid] == second[start:mid]:
+                start = mid
+            else:
+                stop = mid
+        return start
+    return None
+
+
+def padding_is_zero(data: bytes, bit_index: int) -> bool:
+    """Return whether every MSB-first bit of ``data`` from ``bit_index`` onwards is zero."""
+    byte_index, bit_offset = divmod(bit_index, 8)
+    if bit_offset:
+        if byte_index < len(data) and data[byte_index] & (0xFF >> bit_offset):
+            return False
+        byte_index += 1
+    # any() walks the trailing bytes in C instead of one bit_at call per bit.
+    return not any(memoryview(data)[byte_index:])
+
+
+def _block_mismatches(first: "np.ndarray", second: "np.ndarray", limit: int) -> "np.ndarray":
+    """Return up to ``limit`` differing byte offsets of two equal-length ``uint8`` arrays.
+
+    The bulk is compared eight bytes at a time as ``uint64`` words; only the
+    first ``limit`` differing words and the sub-word tail are inspected per byte.
+    """
+    word_bytes = len(first) & ~7
+    words = np.flatnonzero(first[:word_bytes].view(np.uint64) != second[:word_bytes].view(np.uint64))
+    candidates = (words[:limit, None] * 8 + np.arange(8)).ravel()
+    head = candidates[first[candidates] != second[candidates]]
+    tail = word_bytes + np.flatnonzero(first[word_bytes:] != second[word_bytes:])
+    return np.concatenate((head, tail))[:limit]
+
+
+def byte_mismatches(first: bytes, second: bytes, limit: int) -> list[int]:
+    """Return up to ``limit`` indices where the common prefix of two buffers differs."""
+    compare_len = min(len(first), len(second))
+    differing_indices: list[int] = []
+    if np is not None:
+        first_array = np.frombuffer(first, dtype=np.uint8, count=compare_len)
+        second_array = np.frombuffer(second, dtype=np.uint8, count=compare_len)
+        # Scan block-wise so the temporary mask stays small on mapped inputs.
+        for start in range(0, compare_len, SCAN_BLOCK_BYTES):
+            end = start + SCAN_BLOCK_BYTES
+            block = _block_mismatches(first_array[start:end], second_array[start:end], limit)
+            differing_indices.extend((block[: limit - len(differing_indices)] + start).tolist())
+            if len(differing_indices) >= limit:
+                break
+        return differing_indices
+    # Views keep the window slices in first_mismatch zero-copy for bytes inputs.
+    first_view = memoryview(first)
+    second_view = memoryview(second)
+    idx = first_mismatch(first_view, second_view, 0, compare_len)
+    while idx is not None and len(differing_indices) < limit:
+        differing_indices.append(idx)
+        idx = first_mismatch(first_view, second_view, idx + 1, compare_len)
+    return differing_indices
+
+
+def bit_mismatches(
+    first: bytes, second: bytes, byte_indices: list[int], bit_count: int, limit: int
+) -> list[int]:
+    """Return up to ``limit`` MSB-first bit indices below ``bit_count`` where the buffers differ.
+
+    Bits can only differ inside differing bytes, so only ``byte_indices`` (in
+    ascending order, as returned by :func:`byte_mismatches`) are expanded.
+    """
+    differing_bits: list[int] = []
+    for byte_index in byte_indices:
+        diff = first[byte_index] ^ second[byte_index]
+        for bit_offset in range(8):
+            bit_index = byte_index * 8 + bit_offset
+            if bit_index >= bit_count:
+                return differing_bits
+            if (diff >> (7 - bit_offset)) & 1:
+                differing_bits.append(bit_index)
+                if len(differing_bits) >= limit:
+                    return differing_bits
+    return differing_bits
+
+
+def export_payload(container: Path, info: ContainerInfo, destination: Path) -> None:
+    """Write the container payload to ``destination``, copying in-kernel where possible."""
+    offset = len(info.header_bytes)
+    count = len(info.payload)
+    with destination.open("wb") as target:
+        if hasattr(os, "sendfile"):
+            try:
+                with container.open("rb") as source:
+                    copied = 0
+                    while copied < count:
+                        sent = os.sendfile(target.fileno(), source.fileno(), offset + copied, count - copied)
+                        if sent == 0:
+                            raise OSError("container ended before the payload was copied")
+                        copied += sent
+                return
+            except OSError:
+                # Some platforms only sendfile() to sockets; fall back to a plain write.
+                target.seek(0)
+                target.truncate()
+        target.write(info.payload)
+
+
 def compare_payloads(
     container: Path,
     hdl_payload: Path,
@@ -180,12 +362,71 @@ def compare_payloads(
     decoder: Path | None,
 ) -> int:
     info = parse_container(container)
-    reference_payload = info.payload
     if payload_output is not None:
         payload_output.parent.mkdir(parents=True, exist_ok=True)
-        payload_output.write_bytes(reference_payload)
+        export_payload(container, info, payload_output)
+
+    hdl_bytes = map_file(hdl_payload)
+    roundtrip_ready = (
+        input_file is not None
+        and input_file.exists()
+        and decoder is not None
+        and decoder.exists()
+    )
+    with ExitStack() as stack:
+        decodes = []
+        if roundtrip_ready:
+            tmp_dir = Path(stack.enter_context(TemporaryDirectory()))
+            decoded_path = tmp_dir / "decoded_cpp.bsq"
+            hdl_container_path = tmp_dir / "hdl_payload.c123"
+            with hdl_container_path.open("wb") as hdl_container:
+                hdl_container.write(info.header_bytes)
+                hdl_container.write(hdl_bytes)
+            hdl_decoded_path = tmp_dir / "decoded_hdl.bsq"
+            # Start both decodes up front so they run while the payloads are compared.
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=2))
+            decodes = [
+                pool.submit(decode_container, decoder, container, decoded_path),
+                pool.submit(decode_container, decoder, hdl_container_path, hdl_decoded_path),
+            ]
+
+        exit_code = report_payload_mismatches(info, hdl_bytes, input_bytes)
+
+        roundtrip_status = 0
+        if input_file is not None:
+            if not input_file.exists():
+                print(
+                    f"Input reference file '{input_file}' does not exist; skipping round-trip check",
+                    file=sys.stderr,
+                )
+                roundtrip_status = 1
+            elif decoder is None:
+                print(
+                    "Decoder path not provided; skipping round-trip verification",
+                    file=sys.stderr,
+                )
+            elif not decoder.exists():
+                print(
+                    f"Decoder binary '{decoder}' not found; skipping round-trip verification",
+                    file=sys.stderr,
+                )
+            else:
+                try:
+                    for decode in decodes:
+                        decode.result()
+                except Exception as exc:  # pragma: no cover - external tool invocation
+                    print(f"Decoder invocation failed: {exc}", file=sys.stderr)
+                    roundtrip_status = 1
+                else:
+                    cpp_status = compare_raw_streams("C++ round-trip", input_file, decoded_path)
+                    hdl_status = compare_raw_streams("HDL round-trip", input_file, hdl_decoded_path)
+                    roundtrip_status = cpp_status or hdl_status
+
+    return 1 if exit_code or roundtrip_status else 0
 
-    hdl_bytes = hdl_payload.read_bytes()
+
+def report_payload_mismatches(info: ContainerInfo, hdl_bytes: memoryview, input_bytes: int) -> int:
+    reference_payload = info.payload
     print(
         f"Payload lengths: HDL={len(hdl_bytes)} bytes, reference={len(reference_payload)} bytes"
     )
@@ -219,12 +460,10 @@ def compare_payloads(
         exit_code = 1
 
     compare_len = min(len(hdl_bytes), len(reference_payload))
-    differing_indices: list[int] = []
-    for idx in range(compare_len):
-        if hdl_bytes[idx] != reference_payload[idx]:
-            differing_indices.append(idx)
-            if len(differing_indices) >= MISMATCH_LIMIT:
-                break
+    if buffers_equal(hdl_bytes[:compare_len], reference_payload[:compare_len]):
+        differing_indices: list[int] = []
+    else:
+        differing_indices = byte_mismatches(hdl_bytes, reference_payload, MISMATCH_LIMIT)
 
     if differing_indices:
         exit_code = 1
@@ -248,23 +487,24 @@ def compare_payloads(
         print(format_slice(hdl_bytes[start:end], start), file=sys.stderr)
 
     bits_available = len(hdl_bytes) * 8
-    bit_mismatches: list[int] = []
-    for bit_index in range(min(info.payload_bits, bits_available)):
-        if bit_at(reference_payload, bit_index) != bit_at(hdl_bytes, bit_index):
-            bit_mismatches.append(bit_index)
-            if len(bit_mismatches) >= MISMATCH_LIMIT:
-                break
+    differing_bits = bit_mismatches(
+        reference_payload,
+        hdl_bytes,
+        differing_indices,
+        min(info.payload_bits, bits_available),
+        MISMATCH_LIMIT,
+    )
 
-    if bit_mismatches:
+    if differing_bits:
         exit_code = 1
-        first_bit = bit_mismatches[0]
-        last_bit = bit_mismatches[-1]
+        first_bit = differing_bits[0]
+        last_bit = differing_bits[-1]
         print(
             f"Bit-level mismatch detected. First differing bit {first_bit} (byte {first_bit // 8}), "
             f"last reported bit {last_bit}.",
             file=sys.stderr,
         )
-        for bit_index in bit_mismatches:
+        for bit_index in differing_bits:
             byte_index, bit_offset = divmod(bit_index, 8)
             ref_bit = bit_at(reference_payload, bit_index)
             hdl_bit = bit_at(hdl_bytes, bit_index)
@@ -283,9 +523,7 @@ def compare_payloads(
         extra_bits = bits_available - info.payload_bits
         trailing_start = info.payload_bits // 8
         trailing_slice = hdl_bytes[trailing_start:trailing_start + DEBUG_BYTES]
-        non_zero_extra = any(
-            bit_at(hdl_bytes, info.payload_bits + bit) == 1 for bit in range(extra_bits)
-        )
+        non_zero_extra = not padding_is_zero(hdl_bytes, info.payload_bits)
         descriptor = "non-zero" if non_zero_extra else "all-zero"
         print(
             f"HDL payload provides {extra_bits} extra padding bit(s) beyond the {info.payload_bits} encoded bits ({descriptor}).",
@@ -309,46 +547,11 @@ def compare_payloads(
     )
     if exit_code == 0:
         print("HDL payload matches C++ reference payload")
-
-    roundtrip_status = 0
-    if input_file is not None:
-        if not input_file.exists():
-            print(
-                f"Input reference file '{input_file}' does not exist; skipping round-trip check",
-                file=sys.stderr,
-            )
-            roundtrip_status = 1
-        elif decoder is None:
-            print(
-                "Decoder path not provided; skipping round-trip verification",
-                file=sys.stderr,
-            )
-        elif not decoder.exists():
-            print(
-                f"Decoder binary '{decoder}' not found; skipping round-trip verification",
-                file=sys.stderr,
-            )
-        else:
-            with TemporaryDirectory() as tmp_dir:
-                decoded_path = Path(tmp_dir) / "decoded_cpp.bsq"
-                hdl_container_path = Path(tmp_dir) / "hdl_payload.c123"
-                hdl_container_path.write_bytes(info.header_bytes + hdl_bytes)
-                hdl_decoded_path = Path(tmp_dir) / "decoded_hdl.bsq"
-                try:
-                    decode_container(decoder, container, decoded_path)
-                    decode_container(decoder, hdl_container_path, hdl_decoded_path)
-                except Exception as exc:  # pragma: no cover - external tool invocation
-                    print(f"Decoder invocation failed: {exc}", file=sys.stderr)
-                    roundtrip_status = 1
-                else:
-                    cpp_status = compare_raw_streams("C++ round-trip", input_file, decoded_path)
-                    hdl_status = compare_raw_streams("HDL round-trip", input_file, hdl_decoded_path)
-                    roundtrip_status = cpp_status or hdl_status
-
-    return 1 if exit_code or roundtrip_status else 0
+    return exit_code
 
 
-def main(argv: list[str] | None = None) -> int:
+@lru_cache(maxsize=None)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--container", type=Path, required=True, help="Path to the C++ container file")
     parser.add_argument("--hdl-payload", type=Path, required=True, help="Path to the HDL payload dump")
@@ -360,7 +563,11 @@ def main(argv: list[str] | None = None) -> int:
         type=Path,
         help="Optional path to the ccsds123_decode binary for round-trip verification",
     )
-    args = parser.parse_args(argv)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     try:
         return compare_payloads(
@@ -7,11 +7,22 @@ with frames replacing spectral bands in the CCSDS 123 algorithm.
 from __future__ import annotations
 
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import os
 import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import compare_bitstreams
+import gen_impl_params
+
+VIVADO_TAIL_LINES = 20
+BASE_ENV = dict(os.environ)
+
 
 class CompressionResult:
     """Results from compressing a single channel."""
@@ -46,16 +57,34 @@ def run_command(cmd: List[str], description: str) -> subprocess.CompletedProcess
         text=True,
         check=False,
     )
+    report_failure(result)
+    return result
+
+
+def run_compare_bitstreams(argv: List[str]) -> subprocess.CompletedProcess[str]:
+    """Run compare_bitstreams in-process, capturing its output like run_command."""
+    print("  Running: Payload comparison")
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        returncode = compare_bitstreams.main(argv)
+    result = subprocess.CompletedProcess(argv, returncode, stdout.getvalue(), stderr.getvalue())
+    report_failure(result)
+    return result
+
+
+def report_failure(result: subprocess.CompletedProcess[str]) -> None:
+    """Print the exit code and captured stderr of a failed step."""
     if result.returncode != 0:
         print(f"    FAILED with exit code {result.returncode}", file=sys.stderr)
         if result.stderr:
             print(f"    STDERR: {result.stderr}", file=sys.stderr)
-    return result
 
 
 def compress_channel(
     channel: str,
     bsq_path: Path,
+    input_bytes: int,
     output_dir: Path,
     encoder: Path,
     decoder: Path,
@@ -63,29 +92,26 @@ def compress_channel(
     ny: int,
     nz: int,
     depth: int,
-    hdl_config: Path,
     vivado_script: Path,
     hdl_build_dir: Path,
     settings_script: str,
     vivado: str,
-    gen_impl_params: Path,
 ) -> CompressionResult:
     """Compress a single channel and compare HDL vs C++ output.
 
     Args:
         channel: Channel name (red, green, blue)
         bsq_path: Path to input BSQ file
+        input_bytes: Size of the input BSQ file in bytes
         output_dir: Directory for outputs
         encoder: Path to ccsds123_encode
         decoder: Path to ccsds123_decode
         nx, ny, nz: Image dimensions
         depth: Bit depth
-        hdl_config: HDL configuration JSON
         vivado_script: Vivado TCL script
-        hdl_build_dir: HDL build directory
+        hdl_build_dir: HDL build directory for this channel
         settings_script: Vivado settings script
         vivado: Vivado binary path
-        gen_impl_params: Path to gen_impl_params.py
 
     Returns:
         CompressionResult with comparison details
@@ -96,17 +122,17 @@ def compress_channel(
 
     cpp_dir = output_dir / "cpp"
     hdl_dir = output_dir / "hdl"
+    # The testbench always writes out.bin, so each channel simulates into its own directory
+    hdl_channel_dir = hdl_dir / channel
     cpp_dir.mkdir(parents=True, exist_ok=True)
-    hdl_dir.mkdir(parents=True, exist_ok=True)
+    hdl_channel_dir.mkdir(parents=True, exist_ok=True)
 
     cpp_container = cpp_dir / f"{channel}.c123"
     cpp_payload = cpp_dir / f"{channel}_payload.bin"
     hdl_payload = hdl_dir / f"{channel}.bin"
 
-    input_bytes = bsq_path.stat().st_size
-
     # Step 1: Encode with C++
-    print(f"\n[1/5] Encoding {channel} channel with C++ codec")
+    print(f"\n[1/4] Encoding {channel} channel with C++ codec")
     encode_cmd = [
         str(encoder),
         "-i", str(bsq_path),
@@ -133,25 +159,15 @@ def compress_channel(
     cpp_cr = input_bytes / cpp_output_bytes if cpp_output_bytes > 0 else 0.0
     print(f"    C++ output: {cpp_output_bytes} bytes, CR: {cpp_cr:.2f}")
 
-    # Step 2: Regenerate HDL parameters
-    print(f"\n[2/5] Regenerating HDL parameters for {nx}×{ny}×{nz}")
-    params_cmd = ["python3", str(gen_impl_params), str(hdl_config)]
-    params_result = run_command(params_cmd, "HDL parameter generation")
-    if params_result.returncode != 0:
-        return CompressionResult(
-            channel, input_bytes, cpp_output_bytes, 0, cpp_cr, 0.0, False,
-            f"HDL parameter generation failed: {params_result.stderr}"
-        )
-
-    # Step 3: Run Vivado simulation
-    print(f"\n[3/5] Running Vivado HDL simulation for {channel} channel")
+    # Step 2: Run Vivado simulation
+    print(f"\n[2/4] Running Vivado HDL simulation for {channel} channel")
     hdl_build_dir.mkdir(parents=True, exist_ok=True)
 
     # Set environment variables for Vivado
     vivado_env = {
         "HDL_SKIP_PARAM_GEN": "1",
         "HDL_INPUT_FILE": str(bsq_path.absolute()),
-        "HDL_OUTPUT_DIR": str(hdl_dir.absolute()),
+        "HDL_OUTPUT_DIR": str(hdl_channel_dir.absolute()),
     }
 
     vivado_cmd = [
@@ -162,23 +178,31 @@ def compress_channel(
     ]
 
     print(f"    Simulating with input: {bsq_path.name}")
-    sim_result = subprocess.run(
+    # Stream the Vivado log to disk instead of holding it in memory; keep the tail for errors
+    vivado_log = hdl_channel_dir / "vivado.log"
+    log_tail: deque[str] = deque(maxlen=VIVADO_TAIL_LINES)
+    with subprocess.Popen(
         vivado_cmd,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
         text=True,
-        check=False,
-        env={**subprocess.os.environ, **vivado_env},
-    )
-
-    if sim_result.returncode != 0:
+        env=BASE_ENV | vivado_env,
+    ) as sim_process, vivado_log.open("w", encoding="utf-8") as log_file:
+        for line in sim_process.stdout:
+            log_file.write(line)
+            log_tail.append(line)
+    returncode = sim_process.wait()
+
+    if returncode != 0:
         return CompressionResult(
             channel, input_bytes, cpp_output_bytes, 0, cpp_cr, 0.0, False,
-            f"Vivado simulation failed: {sim_result.stderr[:200]}"
+            f"Vivado simulation failed (log: {vivado_log}): {''.join(log_tail)[-200:]}"
         )
 
     # Rename generic out.bin to channel-specific name
     # Testbench always writes to out.bin, but we need channel-specific files
-    generic_output = hdl_dir / "out.bin"
+    generic_output = hdl_channel_dir / "out.bin"
     if generic_output.exists():
         generic_output.rename(hdl_payload)
         print(f"    Renamed {generic_output.name} → {hdl_payload.name}")
@@ -192,11 +216,9 @@ def compress_channel(
     hdl_cr = input_bytes / hdl_output_bytes if hdl_output_bytes > 0 else 0.0
     print(f"    HDL output: {hdl_output_bytes} bytes, CR: {hdl_cr:.2f}")
 
-    # Step 4: Compare payloads
-    print(f"\n[4/5] Comparing HDL and C++ payloads for {channel} channel")
-    compare_cmd = [
-        "python3",
-        str(Path(__file__).parent / "compare_bitstreams.py"),
+    # Step 3: Compare payloads
+    print(f"\n[3/4] Comparing HDL and C++ payloads for {channel} channel")
+    compare_args = [
         "--container", str(cpp_container),
         "--hdl-payload", str(hdl_payload),
         "--payload-output", str(cpp_payload),
@@ -205,7 +227,7 @@ def compress_channel(
         "--decoder", str(decoder),
     ]
 
-    compare_result = run_command(compare_cmd, "Payload comparison")
+    compare_result = run_compare_bitstreams(compare_args)
     match = compare_result.returncode == 0
 
     # Check if both round-trips succeeded even if payloads differ
@@ -222,7 +244,7 @@ def compress_channel(
         error_msg = ""
         print(f"    ✓ Payloads match")
 
-    print(f"\n[5/5] {channel.upper()} channel compression complete")
+    print(f"\n[4/4] {channel.upper()} channel compression complete")
 
     return CompressionResult(
         channel,
@@ -370,43 +392,51 @@ def main() -> int:
             "blue": args.bsq_dir / "blue_frames.bsq",
         }
 
-    # Verify all files exist
-    missing = [name for name, path in channel_files.items() if not path.exists()]
+    # Verify all files exist, keeping their sizes for the compression ratios
+    input_sizes: Dict[str, int] = {}
+    missing = []
+    for name, path in channel_files.items():
+        try:
+            input_sizes[name] = path.stat().st_size
+        except FileNotFoundError:
+            missing.append(name)
     if missing:
         print(f"Error: Missing channel files: {', '.join(missing)}", file=sys.stderr)
         return 1
 
-    gen_impl_params = Path(__file__).parent / "gen_impl_params.py"
-    if not gen_impl_params.exists():
-        print(f"Error: gen_impl_params.py not found at {gen_impl_params}", file=sys.stderr)
+    # Parameters depend only on the shared dimensions, so generate them once
+    # before the channel simulations start reading them
+    print(f"Regenerating HDL parameters for {args.nx}×{args.ny}×{args.nz}")
+    try:
+        gen_impl_params.main([str(args.hdl_config)])
+    except Exception as exc:
+        print(f"Error: HDL parameter generation failed: {exc}", file=sys.stderr)
         return 1
 
-    # Process each channel
-    results = []
-    for channel, bsq_path in channel_files.items():
-        result = compress_channel(
-            channel,
-            bsq_path,
-            args.output_dir,
-            args.encoder,
-            args.decoder,
-            args.nx,
-            args.ny,
-            args.nz,
-            args.depth,
-            args.hdl_config,
-            args.vivado_script,
-            args.hdl_build_dir,
-            args.settings_script,
-            args.vivado,
-            gen_impl_params,
-        )
-        results.append(result)
-
-        # Stop early if a channel fails
-        if not result.match:
-            print(f"\n⚠ {channel.upper()} channel failed, stopping early", file=sys.stderr)
-            break
+    # Process the channels in parallel, each with its own Vivado build directory.
+    # Every channel runs to completion so the summary always covers all of them.
+    with ProcessPoolExecutor(max_workers=len(channel_files)) as pool:
+        futures = [
+            pool.submit(
+                compress_channel,
+                channel,
+                bsq_path,
+                input_sizes[channel],
+                args.output_dir,
+                args.encoder,
+                args.decoder,
+                args.nx,
+                args.ny,
+                args.nz,
+                args.depth,
+                args.vivado_script,
+                args.hdl_build_dir / channel,
+                args.settings_script,
+                args.vivado,
+            )
+            for channel, bsq_path in channel_files.items()
+        ]
+        results = [future.result() for future in futures]
 
     # Print summary
     print_summary(results)
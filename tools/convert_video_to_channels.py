@@ -46,36 +46,38 @@ def convert_frames_to_channels(
     for idx, frame_path in enumerate(selected_frames, 1):
         print(f"  {idx}. {frame_path.name}")
 
-    # Initialize channel buffers
-    red_channel = bytearray()
-    green_channel = bytearray()
-    blue_channel = bytearray()
+    # Initialize zero-filled channel buffers sized for every frame
+    frame_bytes = nx * ny * 2
+    red_channel = bytearray(frame_bytes * num_frames)
+    green_channel = bytearray(frame_bytes * num_frames)
+    blue_channel = bytearray(frame_bytes * num_frames)
 
     # Process each frame
-    for frame_path in selected_frames:
-        img = Image.open(frame_path)
-
-        # Verify RGB mode and dimensions
-        if img.mode != "RGB":
-            raise ValueError(f"{frame_path.name}: expected RGB mode, got {img.mode}")
-
-        width, height = img.size
-        if width != nx or height != ny:
-            raise ValueError(
-                f"{frame_path.name}: expected {nx}×{ny}, got {width}×{height}"
-            )
-
-        # Extract pixels in BSQ order (all R, then all G, then all B for this frame)
-        pixels = list(img.getdata())
-
-        # Split into channels and append to temporal sequence
+    for frame_index, frame_path in enumerate(selected_frames):
+        with Image.open(frame_path) as img:
+            # Verify RGB mode and dimensions (header only, before decoding)
+            if img.mode != "RGB":
+                raise ValueError(f"{frame_path.name}: expected RGB mode, got {img.mode}")
+
+            width, height = img.size
+            if width != nx or height != ny:
+                raise ValueError(
+                    f"{frame_path.name}: expected {nx}×{ny}, got {width}×{height}"
+                )
+
+            # Decode the whole frame up front so the file is released on exit
+            img.load()
+            bands = img.split()
+
+        # Split into channels and place in the temporal sequence
         # BSQ layout: band_0 (all pixels), band_1 (all pixels), ...
         # For video: frame_0 (all pixels), frame_1 (all pixels), ...
-        for r, g, b in pixels:
-            # Store 8-bit values in 16-bit little-endian format
-            red_channel.extend(r.to_bytes(2, "little"))
-            green_channel.extend(g.to_bytes(2, "little"))
-            blue_channel.extend(b.to_bytes(2, "little"))
+        offset = frame_index * frame_bytes
+        for channel, band in zip((red_channel, green_channel, blue_channel), bands):
+            # Each band is an 8-bit plane already in raster (BSQ) order.
+            # Store 8-bit values in 16-bit little-endian format: the sample
+            # bytes fill the even positions, the zeroed high bytes stay as-is
+            channel[offset : offset + frame_bytes : 2] = band.tobytes()
 
     # Write channel files
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -93,16 +95,10 @@ def convert_frames_to_channels(
     green_path.write_bytes(green_channel)
     blue_path.write_bytes(blue_channel)
 
-    expected_size = nx * ny * num_frames * 2
-    print(f"\nOutput files written:")
-    print(f"  {red_path.name}: {len(red_channel)} bytes (expected {expected_size})")
-    print(f"  {green_path.name}: {len(green_channel)} bytes (expected {expected_size})")
-    print(f"  {blue_path.name}: {len(blue_channel)} bytes (expected {expected_size})")
-
-    if len(red_channel) != expected_size:
-        raise ValueError(
-            f"Size mismatch: generated {len(red_channel)} bytes, expected {expected_size}"
-        )
+    print(f"\nOutput files written ({num_frames} frame(s) of {nx}×{ny}):")
+    print(f"  {red_path.name}: {len(red_channel)} bytes")
+    print(f"  {green_path.name}: {len(green_channel)} bytes")
+    print(f"  {blue_path.name}: {len(blue_channel)} bytes")
 
 
 def main() -> int:
@@ -4,15 +4,16 @@ import sys
 
 from ccsds_lib import write_sim_params, write_vhdl_params
 
-def main():
-    if len(sys.argv) < 2:
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) < 1:
         print("usage: gen_impl_params.py <config>")
         return -1
 
-    config_path = Path(sys.argv[1]).expanduser().resolve()
+    config_path = Path(argv[0]).expanduser().resolve()
 
-    with config_path.open('r', encoding='utf-8') as config_file:
-        config = json.load(config_file)
+    config = json.loads(config_path.read_bytes())
 
     parameters = config['parameters']
     image = config['images'][0]
@@ -27,4 +28,5 @@ def main():
     write_sim_params(dimensions, parameters, signed, str(tb_dir / "impl_params.v"))
     write_vhdl_params(dimensions, parameters, signed, str(tb_dir / "synth_params.vhd"))
 
-main()
+if __name__ == "__main__":
+    main()
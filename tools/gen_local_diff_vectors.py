@@ -16,7 +16,13 @@ for path in (SRC_ROOT, REPO_ROOT):
     if str(path) not in sys.path:
         sys.path.insert(0, str(path))
 
-from python_reference import CtrlSignals, LocalSamples, local_diff_reference
+from python_reference import (
+    CtrlSignals,
+    LocalDiffOutputs,
+    LocalSamples,
+    local_diff_reference,
+    local_diff_reference_batch,
+)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -28,14 +34,26 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _sample_value(depth: int, signed: bool, rng: random.Random) -> int:
-    if signed:
-        lo = -(1 << (depth - 1))
-        hi = (1 << (depth - 1)) - 1
-    else:
-        lo = 0
-        hi = (1 << depth) - 1
-    return rng.randint(lo, hi)
+def _reference_outputs(
+    cases: list[tuple[bool, CtrlSignals, LocalSamples]]
+) -> list[LocalDiffOutputs]:
+    """Evaluate the reference model for every case, in one batch when NumPy is available."""
+    try:
+        batch = local_diff_reference_batch(
+            [ctrl.first_line for _, ctrl, _ in cases],
+            [ctrl.first_in_line for _, ctrl, _ in cases],
+            [ctrl.last_in_line for _, ctrl, _ in cases],
+            [samples.cur for _, _, samples in cases],
+            [samples.north for _, _, samples in cases],
+            [samples.north_east for _, _, samples in cases],
+            [samples.north_west for _, _, samples in cases],
+            [samples.west for _, _, samples in cases],
+            [column_oriented for column_oriented, _, _ in cases],
+        )
+    except ImportError:
+        return [local_diff_reference(ctrl, samples, column_oriented) for column_oriented, ctrl, samples in cases]
+    columns = (batch[name].tolist() for name in LocalDiffOutputs._fields)
+    return [LocalDiffOutputs(*row) for row in zip(*columns)]
 
 
 def main() -> None:
@@ -46,6 +64,11 @@ def main() -> None:
     depth = int(params["D"])
     signed = str(image.get("signed", "false")).lower() == "true"
 
+    if signed:
+        sample_range = (-(1 << (depth - 1)), (1 << (depth - 1)) - 1)
+    else:
+        sample_range = (0, (1 << depth) - 1)
+
     rng = random.Random(args.seed)
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
@@ -66,42 +89,27 @@ def main() -> None:
         "d_w",
     ]
 
-    with args.output.open("w", newline="", encoding="utf-8") as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-        writer.writeheader()
-        for column_oriented in (False, True):
-            for _ in range(args.cases):
-                ctrl = CtrlSignals(
-                    first_line=bool(rng.randrange(2)),
-                    first_in_line=bool(rng.randrange(2)),
-                    last_in_line=bool(rng.randrange(2)),
-                )
-                samples = LocalSamples(
-                    cur=_sample_value(depth, signed, rng),
-                    north=_sample_value(depth, signed, rng),
-                    north_east=_sample_value(depth, signed, rng),
-                    north_west=_sample_value(depth, signed, rng),
-                    west=_sample_value(depth, signed, rng),
-                )
-                outputs = local_diff_reference(ctrl, samples, column_oriented)
-                writer.writerow(
-                    {
-                        "column_oriented": int(column_oriented),
-                        "first_line": int(ctrl.first_line),
-                        "first_in_line": int(ctrl.first_in_line),
-                        "last_in_line": int(ctrl.last_in_line),
-                        "cur": samples.cur,
-                        "north": samples.north,
-                        "north_east": samples.north_east,
-                        "north_west": samples.north_west,
-                        "west": samples.west,
-                        "local_sum": outputs.local_sum,
-                        "d_c": outputs.d_c,
-                        "d_n": outputs.d_n,
-                        "d_nw": outputs.d_nw,
-                        "d_w": outputs.d_w,
-                    }
-                )
+    # Draw in the historical order (three ctrl bits, then the samples in field
+    # order) so a given seed keeps producing the committed vectors.
+    randrange = rng.randrange
+    randint = rng.randint
+    cases: list[tuple[bool, CtrlSignals, LocalSamples]] = []
+    for column_oriented in (False, True):
+        for _ in range(args.cases):
+            ctrl = CtrlSignals._make([bool(randrange(2)) for _ in CtrlSignals._fields])
+            samples = LocalSamples._make([randint(*sample_range) for _ in LocalSamples._fields])
+            cases.append((column_oriented, ctrl, samples))
+
+    # Rows follow the fieldnames order: orientation, ctrl bits, samples, outputs
+    rows = [
+        (int(column_oriented), *map(int, ctrl), *samples, *outputs)
+        for (column_oriented, ctrl, samples), outputs in zip(cases, _reference_outputs(cases))
+    ]
+
+    with args.output.open("w", newline="", encoding="utf-8", buffering=1 << 20) as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
 
 
 if __name__ == "__main__":
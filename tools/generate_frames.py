@@ -8,8 +8,19 @@ import pathlib
 import struct
 from typing import Iterable
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 
 def generate_frame(nx: int, ny: int, nz: int, seed: int) -> bytes:
+    if np is not None:
+        x = np.arange(nx, dtype=np.int64)
+        y = np.arange(ny, dtype=np.int64)[:, None]
+        z = np.arange(nz, dtype=np.int64)[:, None, None]
+        values = (x * 37 + y * 23 + z * 59 + seed * 131) % (1 << 16)
+        return values.astype("<u2").tobytes()
     data = bytearray()
     for z in range(nz):
         for y in range(ny):
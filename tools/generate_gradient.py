@@ -4,8 +4,20 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 
 def generate_gradient(nx: int, ny: int, nz: int, path: Path) -> None:
+    if np is not None:
+        x = np.arange(nx, dtype=np.int64)
+        y = np.arange(ny, dtype=np.int64)[:, None]
+        band = np.arange(nz, dtype=np.int64)[:, None, None]
+        values = (x * 5 + y * 3 + band * 11) & 0xFF
+        path.write_bytes(values.astype("<u2").tobytes())
+        return
     data = bytearray()
     for band in range(nz):
         for y in range(ny):
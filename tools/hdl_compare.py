@@ -1,26 +1,45 @@
 import argparse
+from array import array
 from pathlib import Path
+import sys
 from typing import Sequence
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
-def read_bsq(path: Path, nx: int, ny: int, nz: int) -> list[int]:
+
+def read_bsq(path: Path, nx: int, ny: int, nz: int) -> Sequence[int]:
     data = path.read_bytes()
     expected = nx * ny * nz * 2
     if len(data) != expected:
         raise ValueError(f"Unexpected BSQ size: {len(data)} bytes, expected {expected}")
-    values: list[int] = []
-    for i in range(0, len(data), 2):
-        values.append(int.from_bytes(data[i : i + 2], "little"))
+    if np is not None:
+        return np.frombuffer(data, dtype="<u2")
+    values = array("H", data)
+    if sys.byteorder == "big":
+        values.byteswap()
     return values
 
 
 def compare_sequences(name: str, expected: Sequence[int], actual: Sequence[int]) -> int:
-    mismatches = 0
-    for idx, (exp, act) in enumerate(zip(expected, actual)):
-        if exp != act:
-            if mismatches < 20:
-                print(f"Mismatch in {name} at sample {idx}: expected {exp}, got {act}")
-            mismatches += 1
+    if np is not None:
+        common = min(len(expected), len(actual))
+        expected_values = np.asarray(expected[:common])
+        actual_values = np.asarray(actual[:common])
+        differing = np.flatnonzero(expected_values != actual_values)
+        for idx in differing[:20].tolist():
+            exp, act = int(expected_values[idx]), int(actual_values[idx])
+            print(f"Mismatch in {name} at sample {idx}: expected {exp}, got {act}")
+        mismatches = int(differing.size)
+    else:
+        mismatches = 0
+        for idx, (exp, act) in enumerate(zip(expected, actual)):
+            if exp != act:
+                if mismatches < 20:
+                    print(f"Mismatch in {name} at sample {idx}: expected {exp}, got {act}")
+                mismatches += 1
     if len(expected) != len(actual):
         print(f"Length mismatch for {name}: expected {len(expected)}, got {len(actual)}")
         mismatches += abs(len(expected) - len(actual))